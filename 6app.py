@@ -1,7 +1,11 @@
 import streamlit as st
 import pandas as pd
 import io
-from datetime import datetime, timedelta
+from datetime import datetime
+
+from tracker_common import platforms, empty_grid
+from tracker_stats import GridAggregates
+from grid_state import GridState
 
 # Page configuration
 st.set_page_config(page_title="Social Media Habit Tracker", page_icon="🔥", layout="wide")
@@ -41,26 +45,30 @@ st.markdown("""
 st.title("🔥 30-Day Social Media Posting Challenge")
 st.markdown("### *Build your consistency habit across 10 platforms*")
 
-# Platform list
-platforms = [
-    "Facebook", "Instagram", "X (Twitter)", "Threads", "Pinterest",
-    "TikTok", "YouTube", "LinkedIn", "Fanbase", "Facebook Groups"
-]
-
 # Initialize session state
-if 'df' not in st.session_state:
-    start_date = datetime.now()
-    dates = [(start_date + timedelta(days=i)).strftime("%Y-%m-%d") for i in range(30)]
-    
-    data = {"Day": [i+1 for i in range(30)], "Date": dates}
-    for platform in platforms:
-        data[platform] = [False] * 30
-    
-    st.session_state.df = pd.DataFrame(data)
+if 'grid' not in st.session_state:
+    st.session_state.grid = GridState(empty_grid())
+
+if 'aggregates' not in st.session_state:
+    st.session_state.aggregates = GridAggregates(st.session_state.grid)
 
 if 'challenge_start_date' not in st.session_state:
     st.session_state.challenge_start_date = datetime.now().strftime("%Y-%m-%d")
 
+# Checkbox callback: stage the change so the whole rerun is applied in one commit
+def stage_checkbox(key, day_idx, platform):
+    st.session_state.grid.stage(day_idx, platform, st.session_state[key])
+
+# Grid listener: after a bulk load, drop checkbox widget state so the widgets show the new grid
+def reset_checkbox_widgets(changes, version):
+    if changes is None:
+        for key in list(st.session_state.keys()):
+            if str(key).startswith(('compact_', 'detailed_')):
+                del st.session_state[key]
+
+st.session_state.grid.subscribe('checkbox_widgets', reset_checkbox_widgets)
+st.session_state.grid.commit()
+
 # Sidebar
 st.sidebar.header("⚙️ Settings")
 
@@ -76,51 +84,40 @@ st.sidebar.markdown("---")
 
 # File operations
 uploaded_file = st.sidebar.file_uploader("📂 Load Progress", type=['csv'])
-if uploaded_file is not None:
-    st.session_state.df = pd.read_csv(uploaded_file)
-    for platform in platforms:
-        if platform in st.session_state.df.columns:
-            st.session_state.df[platform] = st.session_state.df[platform].astype(bool)
+# The uploader returns the same file on every rerun; only load each upload once
+if uploaded_file is not None and uploaded_file.file_id != st.session_state.get('uploaded_csv_id'):
+    st.session_state.uploaded_csv_id = uploaded_file.file_id
+    st.session_state.grid.replace(pd.read_csv(uploaded_file))
     st.sidebar.success("✅ Progress loaded!")
 
-csv_buffer = io.StringIO()
-st.session_state.df.to_csv(csv_buffer, index=False)
+if st.session_state.get('export_version') != st.session_state.grid.version:
+    csv_buffer = io.StringIO()
+    st.session_state.grid.df.to_csv(csv_buffer, index=False)
+    st.session_state.export_csv = csv_buffer.getvalue()
+    st.session_state.export_version = st.session_state.grid.version
 st.sidebar.download_button(
     label="💾 Save Progress",
-    data=csv_buffer.getvalue(),
+    data=st.session_state.export_csv,
     file_name=f"habit_tracker_{datetime.now().strftime('%Y%m%d')}.csv",
     mime="text/csv"
 )
 
 if st.sidebar.button("🔄 Reset Challenge"):
+    reset_df = st.session_state.grid.df.copy()
     for platform in platforms:
-        st.session_state.df[platform] = False
+        reset_df[platform] = False
+    st.session_state.grid.replace(reset_df)
     st.session_state.challenge_start_date = datetime.now().strftime("%Y-%m-%d")
     st.rerun()
 
 # Calculate statistics
-total_posts = sum([st.session_state.df[platform].sum() for platform in platforms])
-total_possible = 30 * len(platforms)
-completion_rate = (total_posts / total_possible * 100)
-
-# Calculate streak
-current_streak = 0
-longest_streak = 0
-temp_streak = 0
-
-for i in range(30):
-    posts_today = sum([st.session_state.df.loc[i, platform] for platform in platforms])
-    if posts_today >= 5:  # At least 5 platforms posted
-        temp_streak += 1
-        longest_streak = max(longest_streak, temp_streak)
-        if i < days_elapsed:
-            current_streak = temp_streak
-    else:
-        temp_streak = 0
-        if i < days_elapsed:
-            current_streak = 0
-
-days_with_all_posts = sum([all([st.session_state.df.loc[i, platform] for platform in platforms]) for i in range(30)])
+stats = st.session_state.aggregates.stats(days_elapsed)
+total_posts = stats["total_posts"]
+total_possible = stats["total_possible"]
+completion_rate = stats["completion_rate"]
+current_streak = stats["current_streak"]
+longest_streak = stats["longest_streak"]
+days_with_all_posts = stats["days_with_all_posts"]
 
 # Main dashboard
 st.markdown("## 📊 Your Progress Dashboard")
@@ -144,7 +141,7 @@ with col3:
     st.markdown(f"<center>All 10 platforms</center>", unsafe_allow_html=True)
 
 with col4:
-    avg_per_day = total_posts / 30
+    avg_per_day = stats["avg_per_day"]
     st.markdown("### 📈 Daily Average")
     st.markdown(f"<div class='big-metric'>{avg_per_day:.1f}</div>", unsafe_allow_html=True)
     st.markdown(f"<center>platforms per day</center>", unsafe_allow_html=True)
@@ -165,6 +162,9 @@ st.markdown("## 📅 30-Day Habit Grid")
 # View selector
 view_mode = st.radio("View Mode:", ["Compact Grid", "Detailed Checklist"], horizontal=True)
 
+grid = st.session_state.grid
+day_counts = grid.day_counts()
+
 if view_mode == "Compact Grid":
     # Create a visual grid
     st.markdown("*Click on a day below to mark platforms*")
@@ -176,8 +176,7 @@ if view_mode == "Compact Grid":
             day_idx = week * 5 + day_in_week
             if day_idx < 30:
                 with cols[day_in_week]:
-                    row = st.session_state.df.iloc[day_idx]
-                    posts_count = sum([row[platform] for platform in platforms])
+                    posts_count = int(day_counts[day_idx])
                     
                     # Determine status
                     if posts_count == 10:
@@ -195,18 +194,20 @@ if view_mode == "Compact Grid":
                     
                     # Create expandable day card
                     with st.expander(f"**Day {day_idx + 1}** {status}", expanded=False):
-                        st.caption(row['Date'])
+                        st.caption(grid.df.at[day_idx, 'Date'])
                         st.progress(posts_count / 10)
                         st.caption(f"{posts_count}/10 platforms")
                         
                         # Quick checkboxes
                         for platform in platforms:
-                            checked = st.checkbox(
+                            key = f"compact_{day_idx}_{platform}"
+                            st.checkbox(
                                 platform,
-                                value=st.session_state.df.loc[day_idx, platform],
-                                key=f"compact_{day_idx}_{platform}"
+                                value=grid.value(day_idx, platform),
+                                key=key,
+                                on_change=stage_checkbox,
+                                args=(key, day_idx, platform)
                             )
-                            st.session_state.df.loc[day_idx, platform] = checked
 
 else:  # Detailed Checklist
     # Filter options
@@ -215,8 +216,8 @@ else:  # Detailed Checklist
         ["All Days", "Incomplete Only", "Perfect Days", "This Week"]
     )
     
-    for idx, row in st.session_state.df.iterrows():
-        posts_count = sum([row[platform] for platform in platforms])
+    for idx, row in enumerate(grid.df[['Day', 'Date']].to_dict('records')):
+        posts_count = int(day_counts[idx])
         
         # Apply filter
         show_day = True
@@ -249,12 +250,14 @@ else:  # Detailed Checklist
                 for i, platform in enumerate(platforms):
                     target_col = col1 if i < 5 else col2
                     with target_col:
-                        checked = st.checkbox(
+                        key = f"detailed_{idx}_{platform}"
+                        st.checkbox(
                             platform,
-                            value=st.session_state.df.loc[idx, platform],
-                            key=f"detailed_{idx}_{platform}"
+                            value=grid.value(idx, platform),
+                            key=key,
+                            on_change=stage_checkbox,
+                            args=(key, idx, platform)
                         )
-                        st.session_state.df.loc[idx, platform] = checked
                 
                 # Add notes section
                 if posts_count == 10:
@@ -270,17 +273,14 @@ col1, col2 = st.columns(2)
 
 with col1:
     st.markdown("### Most Consistent Platforms")
-    platform_stats = {platform: st.session_state.df[platform].sum() for platform in platforms}
-    sorted_platforms = sorted(platform_stats.items(), key=lambda x: x[1], reverse=True)
-    
-    for platform, count in sorted_platforms[:5]:
+    for platform, count in stats["most_consistent"]:
         percentage = (count / 30) * 100
         st.markdown(f"**{platform}**: {count}/30 days ({percentage:.0f}%)")
         st.progress(percentage / 100)
 
 with col2:
     st.markdown("### Need More Attention")
-    for platform, count in sorted_platforms[-5:]:
+    for platform, count in stats["need_attention"]:
         percentage = (count / 30) * 100
         st.markdown(f"**{platform}**: {count}/30 days ({percentage:.0f}%)")
         st.progress(percentage / 100)
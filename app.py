@@ -3,10 +3,15 @@ import pandas as pd
 import io
 import json
 import requests
-from datetime import datetime, timedelta
+from datetime import datetime
 from google.oauth2.service_account import Credentials
 import gspread
 
+from tracker_common import platforms, empty_grid
+from tracker_stats import GridAggregates
+from bulk_import import import_posting_log, fold_counts
+from grid_state import GridState
+
 # Page configuration
 st.set_page_config(page_title="Social Media Habit Tracker", page_icon="🔥", layout="wide")
 
@@ -39,25 +44,15 @@ st.markdown("""
 st.title("🔥 30-Day Social Media Posting Challenge")
 st.markdown("### *Build your consistency habit across 10 platforms - Synced with Google Sheets*")
 
-# Platform list
-platforms = [
-    "Facebook", "Instagram", "X (Twitter)", "Threads", "Pinterest",
-    "TikTok", "YouTube", "LinkedIn", "Fanbase", "Facebook Groups"
-]
-
 # Google Sheets Configuration
 SPREADSHEET_ID = "1UkuTf8VwGPIilTxhTEdP9K-zdtZFnThazFdGyxVYfmg"
 
 # Initialize session state
-if 'df' not in st.session_state:
-    start_date = datetime.now()
-    dates = [(start_date + timedelta(days=i)).strftime("%Y-%m-%d") for i in range(30)]
-    
-    data = {"Day": [i+1 for i in range(30)], "Date": dates}
-    for platform in platforms:
-        data[platform] = [False] * 30
-    
-    st.session_state.df = pd.DataFrame(data)
+if 'grid' not in st.session_state:
+    st.session_state.grid = GridState(empty_grid())
+
+if 'aggregates' not in st.session_state:
+    st.session_state.aggregates = GridAggregates(st.session_state.grid)
 
 if 'challenge_start_date' not in st.session_state:
     st.session_state.challenge_start_date = datetime.now().strftime("%Y-%m-%d")
@@ -71,6 +66,9 @@ if 'sync_status' not in st.session_state:
 if 'connected' not in st.session_state:
     st.session_state.connected = False
 
+if 'post_counts' not in st.session_state:
+    st.session_state.post_counts = None
+
 # Function to connect to Google Sheets
 def connect_to_sheets(credentials_json):
     try:
@@ -128,6 +126,32 @@ def save_to_sheets(client, df):
         st.error(f"Error saving to sheets: {str(e)}")
         return False
 
+# Checkbox callback: stage the change so the whole rerun is applied in one commit
+def stage_checkbox(key, day_idx, platform):
+    st.session_state.grid.stage(day_idx, platform, st.session_state[key])
+
+# Grid listener: after a bulk load, drop checkbox widget state so the widgets show the new grid
+def reset_checkbox_widgets(changes, version):
+    if changes is None:
+        for key in list(st.session_state.keys()):
+            if str(key).startswith(('compact_', 'detailed_')):
+                del st.session_state[key]
+
+# Grid listener: imported post counts belong to the grid they were folded into
+def reset_post_counts(changes, version):
+    if changes is None:
+        st.session_state.post_counts = None
+
+# Grid listener: push committed checkbox changes to Google Sheets when auto-save is on
+def auto_save_to_sheets(changes, version):
+    if changes and st.session_state.connected and st.session_state.get('auto_save'):
+        save_to_sheets(st.session_state.client, st.session_state.grid.df)
+
+st.session_state.grid.subscribe('sheets_auto_save', auto_save_to_sheets)
+st.session_state.grid.subscribe('checkbox_widgets', reset_checkbox_widgets)
+st.session_state.grid.subscribe('post_counts', reset_post_counts)
+st.session_state.grid.commit()
+
 # Sidebar
 st.sidebar.header("☁️ Google Sheets Sync")
 
@@ -165,23 +189,20 @@ if st.session_state.connected:
         if st.button("⬇️ Load from Sheets", use_container_width=True):
             loaded_df = load_from_sheets(st.session_state.client)
             if loaded_df is not None:
-                st.session_state.df = loaded_df
+                st.session_state.grid.replace(loaded_df)
                 st.session_state.last_sync = datetime.now().strftime("%Y-%m-%d %H:%M")
                 st.session_state.sync_status = "success_load"
                 st.rerun()
     
     with col2:
         if st.button("⬆️ Save to Sheets", use_container_width=True):
-            if save_to_sheets(st.session_state.client, st.session_state.df):
+            if save_to_sheets(st.session_state.client, st.session_state.grid.df):
                 st.session_state.last_sync = datetime.now().strftime("%Y-%m-%d %H:%M")
                 st.session_state.sync_status = "success_save"
                 st.rerun()
     
     # Auto-save option
-    auto_save = st.sidebar.checkbox("🔄 Auto-save on changes", value=False)
-    
-    if auto_save and 'auto_save_enabled' not in st.session_state:
-        st.session_state.auto_save_enabled = True
+    st.sidebar.checkbox("🔄 Auto-save on changes", value=False, key="auto_save")
 
 # Display sync status
 if st.session_state.sync_status == "success_load":
@@ -206,24 +227,71 @@ st.sidebar.markdown("---")
 
 # Local file operations
 st.sidebar.markdown("### 💾 Local Backup")
-csv_buffer = io.StringIO()
-st.session_state.df.to_csv(csv_buffer, index=False)
+if st.session_state.get('export_version') != st.session_state.grid.version:
+    csv_buffer = io.StringIO()
+    st.session_state.grid.df.to_csv(csv_buffer, index=False)
+    st.session_state.export_csv = csv_buffer.getvalue()
+    st.session_state.export_version = st.session_state.grid.version
 st.sidebar.download_button(
     label="📥 Download CSV",
-    data=csv_buffer.getvalue(),
+    data=st.session_state.export_csv,
     file_name=f"habit_tracker_{datetime.now().strftime('%Y%m%d')}.csv",
     mime="text/csv",
     use_container_width=True
 )
 
 uploaded_file = st.sidebar.file_uploader("📤 Upload CSV", type=['csv'])
-if uploaded_file is not None:
-    st.session_state.df = pd.read_csv(uploaded_file)
-    for platform in platforms:
-        if platform in st.session_state.df.columns:
-            st.session_state.df[platform] = st.session_state.df[platform].astype(bool)
+# The uploader returns the same file on every rerun; only load each upload once
+if uploaded_file is not None and uploaded_file.file_id != st.session_state.get('uploaded_csv_id'):
+    st.session_state.uploaded_csv_id = uploaded_file.file_id
+    st.session_state.grid.replace(pd.read_csv(uploaded_file))
     st.sidebar.success("✅ CSV loaded!")
 
+# Bulk import of platform posting logs
+st.sidebar.markdown("### 📚 Import Posting Logs")
+st.sidebar.caption("Backfill from platform exports (timestamp, platform, post id) as CSV or JSON lines.")
+log_file = st.sidebar.file_uploader("Posting log", type=['csv', 'jsonl', 'ndjson'], label_visibility="collapsed")
+if log_file is not None and st.sidebar.button("📚 Import Log", use_container_width=True):
+    import_progress = st.sidebar.progress(0.0, text="Importing...")
+
+    def update_import_progress(fraction, rows_read):
+        import_progress.progress(fraction, text=f"Importing... {rows_read:,} rows")
+
+    try:
+        counts, summary = import_posting_log(
+            log_file,
+            str(st.session_state.grid.df['Date'].iloc[0]),
+            progress_callback=update_import_progress
+        )
+        folded_df, post_counts = fold_counts(
+            st.session_state.grid.df, counts, st.session_state.post_counts
+        )
+        st.session_state.grid.replace(folded_df)
+        st.session_state.post_counts = post_counts
+        st.sidebar.success(f"✅ Imported {summary['rows_imported']:,} of {summary['rows_read']:,} posts")
+        skipped = summary['rows_read'] - summary['rows_imported']
+        if skipped:
+            st.sidebar.caption(
+                f"Skipped {skipped:,}: {summary['outside_challenge']:,} outside the challenge, "
+                f"{summary['unknown_platform']:,} unknown platform, {summary['bad_timestamp']:,} bad timestamp, "
+                f"{summary['duplicates']:,} duplicates"
+            )
+        if summary['unparseable_lines']:
+            st.sidebar.caption(f"{summary['unparseable_lines']:,} lines could not be parsed as JSON")
+    except Exception as e:
+        st.sidebar.error(f"Error importing log: {str(e)}")
+
+if st.session_state.post_counts is not None:
+    counts_buffer = io.StringIO()
+    st.session_state.post_counts.to_csv(counts_buffer, index=False)
+    st.sidebar.download_button(
+        label="📥 Download Post Counts",
+        data=counts_buffer.getvalue(),
+        file_name=f"post_counts_{datetime.now().strftime('%Y%m%d')}.csv",
+        mime="text/csv",
+        use_container_width=True
+    )
+
 # Setup instructions expander
 with st.sidebar.expander("📖 Setup Instructions"):
     st.markdown("""
@@ -249,28 +317,13 @@ st.sidebar.markdown("---")
 st.sidebar.markdown(f"[📊 Open Google Sheet](https://docs.google.com/spreadsheets/d/{SPREADSHEET_ID}/edit)")
 
 # Calculate statistics
-total_posts = sum([st.session_state.df[platform].sum() for platform in platforms if platform in st.session_state.df.columns])
-total_possible = 30 * len(platforms)
-completion_rate = (total_posts / total_possible * 100)
-
-# Calculate streak
-current_streak = 0
-longest_streak = 0
-temp_streak = 0
-
-for i in range(30):
-    posts_today = sum([st.session_state.df.loc[i, platform] for platform in platforms if platform in st.session_state.df.columns])
-    if posts_today >= 5:
-        temp_streak += 1
-        longest_streak = max(longest_streak, temp_streak)
-        if i < days_elapsed:
-            current_streak = temp_streak
-    else:
-        temp_streak = 0
-        if i < days_elapsed:
-            current_streak = 0
-
-days_with_all_posts = sum([all([st.session_state.df.loc[i, platform] for platform in platforms if platform in st.session_state.df.columns]) for i in range(30)])
+stats = st.session_state.aggregates.stats(days_elapsed)
+total_posts = stats["total_posts"]
+total_possible = stats["total_possible"]
+completion_rate = stats["completion_rate"]
+current_streak = stats["current_streak"]
+longest_streak = stats["longest_streak"]
+days_with_all_posts = stats["days_with_all_posts"]
 
 # Main dashboard
 st.markdown("## 📊 Your Progress Dashboard")
@@ -294,7 +347,7 @@ with col3:
     st.markdown(f"<center>All 10 platforms</center>", unsafe_allow_html=True)
 
 with col4:
-    avg_per_day = total_posts / 30
+    avg_per_day = stats["avg_per_day"]
     st.markdown("### 📈 Daily Average")
     st.markdown(f"<div class='big-metric'>{avg_per_day:.1f}</div>", unsafe_allow_html=True)
     st.markdown(f"<center>platforms per day</center>", unsafe_allow_html=True)
@@ -314,6 +367,9 @@ st.markdown("## 📅 30-Day Habit Grid")
 
 view_mode = st.radio("View Mode:", ["Compact Grid", "Detailed Checklist"], horizontal=True)
 
+grid = st.session_state.grid
+day_counts = grid.day_counts()
+
 if view_mode == "Compact Grid":
     for week in range(6):
         cols = st.columns(5)
@@ -321,8 +377,7 @@ if view_mode == "Compact Grid":
             day_idx = week * 5 + day_in_week
             if day_idx < 30:
                 with cols[day_in_week]:
-                    row = st.session_state.df.iloc[day_idx]
-                    posts_count = sum([row[platform] for platform in platforms if platform in st.session_state.df.columns])
+                    posts_count = int(day_counts[day_idx])
                     
                     if posts_count == 10:
                         status = "✅"
@@ -334,21 +389,19 @@ if view_mode == "Compact Grid":
                         status = "⚪"
                     
                     with st.expander(f"**Day {day_idx + 1}** {status}", expanded=False):
-                        st.caption(row['Date'])
+                        st.caption(grid.df.at[day_idx, 'Date'])
                         st.progress(posts_count / 10)
                         st.caption(f"{posts_count}/10 platforms")
                         
-                        for platform in platforms:
-                            if platform in st.session_state.df.columns:
-                                checked = st.checkbox(
-                                    platform,
-                                    value=st.session_state.df.loc[day_idx, platform],
-                                    key=f"compact_{day_idx}_{platform}"
-                                )
-                                if checked != st.session_state.df.loc[day_idx, platform]:
-                                    st.session_state.df.loc[day_idx, platform] = checked
-                                    if st.session_state.connected and auto_save:
-                                        save_to_sheets(st.session_state.client, st.session_state.df)
+                        for platform in grid.columns:
+                            key = f"compact_{day_idx}_{platform}"
+                            st.checkbox(
+                                platform,
+                                value=grid.value(day_idx, platform),
+                                key=key,
+                                on_change=stage_checkbox,
+                                args=(key, day_idx, platform)
+                            )
 
 else:
     filter_option = st.selectbox(
@@ -356,8 +409,8 @@ else:
         ["All Days", "Incomplete Only", "Perfect Days", "This Week"]
     )
     
-    for idx, row in st.session_state.df.iterrows():
-        posts_count = sum([row[platform] for platform in platforms if platform in st.session_state.df.columns])
+    for idx, row in enumerate(grid.df[['Day', 'Date']].to_dict('records')):
+        posts_count = int(day_counts[idx])
         
         show_day = True
         if filter_option == "Incomplete Only" and posts_count == 10:
@@ -381,18 +434,17 @@ else:
                 col1, col2 = st.columns(2)
                 
                 for i, platform in enumerate(platforms):
-                    if platform in st.session_state.df.columns:
+                    if platform in grid.column_index:
                         target_col = col1 if i < 5 else col2
                         with target_col:
-                            checked = st.checkbox(
+                            key = f"detailed_{idx}_{platform}"
+                            st.checkbox(
                                 platform,
-                                value=st.session_state.df.loc[idx, platform],
-                                key=f"detailed_{idx}_{platform}"
+                                value=grid.value(idx, platform),
+                                key=key,
+                                on_change=stage_checkbox,
+                                args=(key, idx, platform)
                             )
-                            if checked != st.session_state.df.loc[idx, platform]:
-                                st.session_state.df.loc[idx, platform] = checked
-                                if st.session_state.connected and auto_save:
-                                    save_to_sheets(st.session_state.client, st.session_state.df)
                 
                 if posts_count == 10:
                     st.success("🎉 Perfect day! All platforms completed!")
@@ -407,17 +459,14 @@ col1, col2 = st.columns(2)
 
 with col1:
     st.markdown("### Most Consistent Platforms")
-    platform_stats = {platform: st.session_state.df[platform].sum() for platform in platforms if platform in st.session_state.df.columns}
-    sorted_platforms = sorted(platform_stats.items(), key=lambda x: x[1], reverse=True)
-    
-    for platform, count in sorted_platforms[:5]:
+    for platform, count in stats["most_consistent"]:
         percentage = (count / 30) * 100
         st.markdown(f"**{platform}**: {count}/30 days ({percentage:.0f}%)")
         st.progress(percentage / 100)
 
 with col2:
     st.markdown("### Need More Attention")
-    for platform, count in sorted_platforms[-5:]:
+    for platform, count in stats["need_attention"]:
         percentage = (count / 30) * 100
         st.markdown(f"**{platform}**: {count}/30 days ({percentage:.0f}%)")
         st.progress(percentage / 100)
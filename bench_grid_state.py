@@ -0,0 +1,72 @@
+import argparse
+import random
+import timeit
+
+from tracker_common import platforms, CHALLENGE_DAYS, empty_grid
+from grid_state import GridState
+
+# Benchmark of per-rerun grid mutation cost: every rerun renders all 300
+# checkboxes (one read each) and flips the given set of cells, so every
+# rerun really mutates the grid.
+
+
+# 6app.py before GridState: read and write back every cell on every rerun
+def rerun_write_all(df, changes):
+    for day_idx in range(CHALLENGE_DAYS):
+        for platform in platforms:
+            checked = df.loc[day_idx, platform]
+            if (day_idx, platform) in changes:
+                checked = not checked
+            df.loc[day_idx, platform] = checked
+
+
+# app.py before GridState: two scalar reads per cell, scalar write when changed
+def rerun_write_changed(df, changes):
+    for day_idx in range(CHALLENGE_DAYS):
+        for platform in platforms:
+            checked = df.loc[day_idx, platform]
+            if (day_idx, platform) in changes:
+                checked = not checked
+            if checked != df.loc[day_idx, platform]:
+                df.loc[day_idx, platform] = checked
+
+
+# GridState: stage widget changes, one commit, array reads while rendering
+def rerun_grid_state(grid, changes):
+    for day_idx, platform in changes:
+        grid.stage(day_idx, platform, not grid.value(day_idx, platform))
+    grid.commit()
+    for day_idx in range(CHALLENGE_DAYS):
+        for platform in platforms:
+            grid.value(day_idx, platform)
+
+
+def random_changes(count, seed):
+    rng = random.Random(seed)
+    cells = [(day_idx, platform) for day_idx in range(CHALLENGE_DAYS) for platform in platforms]
+    return set(rng.sample(cells, count))
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark per-rerun grid mutation cost.")
+    parser.add_argument("--repeat", type=int, default=5, help="Timing repeats (best is reported)")
+    parser.add_argument("--number", type=int, default=3, help="Reruns per timing repeat")
+    args = parser.parse_args(argv)
+
+    print(f"{'changed cells':>13} {'write all':>12} {'write changed':>14} {'GridState':>12}")
+    for count in (1, 10, 300):
+        changes = random_changes(count, seed=count)
+        timings = []
+        for name, setup in (
+            ("write all", lambda: (empty_grid(), rerun_write_all)),
+            ("write changed", lambda: (empty_grid(), rerun_write_changed)),
+            ("GridState", lambda: (GridState(empty_grid()), rerun_grid_state)),
+        ):
+            target, rerun = setup()
+            best = min(timeit.repeat(lambda: rerun(target, changes), repeat=args.repeat, number=args.number))
+            timings.append(best / args.number * 1000)
+        print(f"{count:>13} {timings[0]:>10.2f}ms {timings[1]:>12.2f}ms {timings[2]:>10.2f}ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,346 @@
+import argparse
+import io
+import json
+import numbers
+import os
+import sys
+
+import numpy as np
+import pandas as pd
+from dateutil.tz import tzlocal
+
+from tracker_common import platforms, CHALLENGE_DAYS, empty_grid
+
+# Column names we recognise in platform export logs, in order of preference
+TIMESTAMP_COLUMNS = ["timestamp", "posted_at", "created_at", "time", "date"]
+PLATFORM_COLUMNS = ["platform", "network", "channel"]
+POST_ID_COLUMNS = ["post_id", "post id", "id"]
+
+# Spellings seen in exports that don't match the tracker's platform names
+PLATFORM_ALIASES = {
+    "fb": "Facebook",
+    "ig": "Instagram",
+    "insta": "Instagram",
+    "x": "X (Twitter)",
+    "twitter": "X (Twitter)",
+    "x/twitter": "X (Twitter)",
+    "yt": "YouTube",
+    "youtube shorts": "YouTube",
+    "tik tok": "TikTok",
+    "linked in": "LinkedIn",
+    "facebook group": "Facebook Groups",
+    "fb groups": "Facebook Groups",
+}
+
+DEFAULT_CHUNKSIZE = 100_000
+
+MISSING_COLUMNS_MESSAGE = (
+    f"Posting log needs a timestamp column ({', '.join(TIMESTAMP_COLUMNS)}) "
+    f"and a platform column ({', '.join(PLATFORM_COLUMNS)})"
+)
+
+# Epoch values at or above this are milliseconds (as seconds it is year 5138)
+EPOCH_MILLIS_THRESHOLD = 1e11
+
+# Digit strings this long are epochs (seconds since 1973 have 9+ digits)
+EPOCH_DIGITS_PATTERN = r"[+-]?\d{9,}(?:\.\d*)?"
+
+# ISO strings ending in Z or a UTC offset carry their own timezone
+UTC_OFFSET_PATTERN = r"(?:Z|[+-]\d{2}:?\d{2})$"
+
+
+# Function to map lower-cased platform spellings to an index into platform_list
+def build_platform_lookup(platform_list=platforms):
+    lookup = {platform.lower(): i for i, platform in enumerate(platform_list)}
+    for alias, platform in PLATFORM_ALIASES.items():
+        if platform in platform_list:
+            lookup.setdefault(alias, platform_list.index(platform))
+    return lookup
+
+
+# Function to combine every accepted column for a field, row by row, so records
+# that use different key names for the same thing are all read
+def coalesce_columns(chunk, candidates):
+    by_name = {str(column).strip().lower(): column for column in chunk.columns}
+    columns = [by_name[candidate] for candidate in candidates if candidate in by_name]
+    if not columns:
+        return None
+    if len(columns) == 1:
+        return chunk[columns[0]]
+    return chunk[columns].bfill(axis=1).iloc[:, 0]
+
+
+# Function to guess the log format from a path or uploaded file name
+def detect_format(source):
+    name = source if isinstance(source, str) else getattr(source, "name", "")
+    name = str(name).lower()
+    if name.endswith((".jsonl", ".ndjson")):
+        return "jsonl"
+    if name.endswith(".json"):
+        raise ValueError("JSON array exports are not supported; convert the log to JSON lines (.jsonl) or CSV")
+    return "csv"
+
+
+# Function to read a JSON-lines file in DataFrame chunks, tracking bytes read
+def iter_jsonl_chunks(handle, chunksize, position):
+    records = []
+    for line in handle:
+        position[0] += len(line)
+        line = line.strip()
+        if not line:
+            continue
+        try:
+            records.append(json.loads(line))
+        except ValueError:
+            position[1] += 1
+            continue
+        if len(records) >= chunksize:
+            yield pd.DataFrame.from_records(records)
+            records = []
+    if records:
+        yield pd.DataFrame.from_records(records)
+
+
+# Function to read a CSV file in DataFrame chunks, tracking bytes read
+def iter_csv_chunks(handle, chunksize, position):
+    wanted = set(TIMESTAMP_COLUMNS + PLATFORM_COLUMNS + POST_ID_COLUMNS)
+    reader = pd.read_csv(
+        handle,
+        chunksize=chunksize,
+        usecols=lambda column: str(column).strip().lower() in wanted,
+        dtype=str,
+        on_bad_lines="skip",
+    )
+    for chunk in reader:
+        position[0] = handle.tell()
+        yield chunk
+
+
+# Function to parse a timestamp column as naive wall-clock time in tz (default: local time).
+# Each value is handled on its own: epoch seconds or milliseconds and ISO strings with
+# an offset are converted to tz, ISO strings without one are taken as already local.
+def parse_timestamps(values, tz=None):
+    if tz is None:
+        tz = tzlocal()
+
+    # Only real numbers and long digit strings are epochs; short digit strings
+    # such as "20260102" are compact dates and go through to_datetime
+    numeric = pd.to_numeric(values, errors="coerce")
+    if pd.api.types.is_numeric_dtype(values):
+        is_epoch = numeric.notna()
+    else:
+        is_number = values.map(lambda value: isinstance(value, numbers.Number) and not isinstance(value, bool))
+        long_digits = values.astype(str).str.strip().str.fullmatch(EPOCH_DIGITS_PATTERN)
+        is_epoch = numeric.notna() & (is_number | long_digits)
+    parts = []
+
+    if is_epoch.any():
+        epoch = numeric[is_epoch].astype(float)
+        seconds = epoch.where(epoch.abs() < EPOCH_MILLIS_THRESHOLD, epoch / 1000)
+        parsed = pd.to_datetime(seconds, unit="s", errors="coerce", utc=True)
+        parts.append(parsed.dt.tz_convert(tz).dt.tz_localize(None))
+
+    text = values[~is_epoch & values.notna()].astype(str).str.strip()
+    if len(text):
+        has_offset = text.str.contains(UTC_OFFSET_PATTERN, regex=True)
+        if has_offset.any():
+            parsed = pd.to_datetime(text[has_offset], errors="coerce", utc=True, format="mixed")
+            parts.append(parsed.dt.tz_convert(tz).dt.tz_localize(None))
+        if (~has_offset).any():
+            parts.append(pd.to_datetime(text[~has_offset], errors="coerce", format="mixed"))
+
+    if not parts:
+        return pd.Series(pd.NaT, index=values.index, dtype="datetime64[ns]")
+    return pd.concat(parts).reindex(values.index)
+
+
+# Function to stream a posting log into per-day, per-platform post counts.
+# Only one chunk is held in memory at a time; the running totals are a
+# CHALLENGE_DAYS x len(platform_list) integer array.
+def import_posting_log(source, start_date, platform_list=platforms, fmt=None,
+                       chunksize=DEFAULT_CHUNKSIZE, progress_callback=None, tz=None):
+    if fmt is None:
+        fmt = detect_format(source)
+
+    lookup = build_platform_lookup(platform_list)
+    start = pd.Timestamp(start_date).normalize()
+    n_platforms = len(platform_list)
+    totals = np.zeros(CHALLENGE_DAYS * n_platforms, dtype=np.int64)
+    summary = {
+        "rows_read": 0,
+        "rows_imported": 0,
+        "bad_timestamp": 0,
+        "unknown_platform": 0,
+        "outside_challenge": 0,
+        "duplicates": 0,
+        "unparseable_lines": 0,
+    }
+
+    handle = open(source, "rb") if isinstance(source, str) else source
+    try:
+        handle.seek(0, io.SEEK_END)
+        total_bytes = handle.tell()
+        handle.seek(0)
+
+        # [bytes read so far, unparseable JSON lines]
+        position = [0, 0]
+        if fmt == "jsonl":
+            chunks = iter_jsonl_chunks(handle, chunksize, position)
+        else:
+            chunks = iter_csv_chunks(handle, chunksize, position)
+
+        found_columns = False
+        for chunk in chunks:
+            summary["rows_read"] += len(chunk)
+
+            # JSON-lines records needn't all carry the same keys, so look fields up per chunk
+            ts_values = coalesce_columns(chunk, TIMESTAMP_COLUMNS)
+            platform_values = coalesce_columns(chunk, PLATFORM_COLUMNS)
+            id_values = coalesce_columns(chunk, POST_ID_COLUMNS)
+            if ts_values is None or platform_values is None:
+                if fmt == "csv":
+                    raise ValueError(MISSING_COLUMNS_MESSAGE)
+                if ts_values is None:
+                    ts_values = pd.Series(None, index=chunk.index, dtype=object)
+                if platform_values is None:
+                    platform_values = pd.Series(None, index=chunk.index, dtype=object)
+            else:
+                found_columns = True
+
+            timestamps = parse_timestamps(ts_values, tz)
+            day_idx = (timestamps.dt.normalize() - start).dt.days
+            platform_idx = platform_values.astype(str).str.strip().str.lower().map(lookup)
+
+            bad_ts = timestamps.isna()
+            unknown = ~bad_ts & platform_idx.isna()
+            outside = ~bad_ts & ~unknown & ((day_idx < 0) | (day_idx >= CHALLENGE_DAYS))
+            keep = ~(bad_ts | unknown | outside)
+
+            summary["bad_timestamp"] += int(bad_ts.sum())
+            summary["unknown_platform"] += int(unknown.sum())
+            summary["outside_challenge"] += int(outside.sum())
+
+            cells = pd.DataFrame({
+                "day": day_idx[keep].astype(np.int64),
+                "platform": platform_idx[keep].astype(np.int64),
+            })
+            # Exports sometimes repeat a post within a page; drop repeats in this chunk
+            if id_values is not None:
+                cells["post_id"] = id_values[keep].values
+                repeated = cells["post_id"].notna() & cells.duplicated()
+                summary["duplicates"] += int(repeated.sum())
+                cells = cells[~repeated]
+
+            codes = cells["day"].to_numpy() * n_platforms + cells["platform"].to_numpy()
+            totals += np.bincount(codes, minlength=totals.size)
+            summary["rows_imported"] += len(cells)
+
+            if progress_callback is not None:
+                fraction = min(position[0] / total_bytes, 1.0) if total_bytes else 1.0
+                progress_callback(fraction, summary["rows_read"])
+
+        summary["unparseable_lines"] = position[1]
+        if summary["rows_read"] and not found_columns:
+            raise ValueError(MISSING_COLUMNS_MESSAGE)
+        if not summary["rows_read"] and summary["unparseable_lines"]:
+            raise ValueError(f"None of the {summary['unparseable_lines']:,} lines in the log could be parsed as JSON")
+    finally:
+        if isinstance(source, str):
+            handle.close()
+
+    counts = empty_grid(start.to_pydatetime(), platform_list)[["Day", "Date"]]
+    grid_counts = totals.reshape(CHALLENGE_DAYS, n_platforms)
+    for i, platform in enumerate(platform_list):
+        counts[platform] = grid_counts[:, i]
+
+    if progress_callback is not None:
+        progress_callback(1.0, summary["rows_read"])
+
+    return counts, summary
+
+
+# Function to fold imported counts into an existing boolean grid (and count table).
+# Counts are matched to grid rows by Date, not by position, and posts on dates
+# the grid doesn't cover are rejected rather than landing on the wrong day.
+def fold_counts(df, counts, existing_counts=None, platform_list=platforms):
+    df = df.copy()
+    present = [platform for platform in platform_list if platform in counts.columns]
+    grid_dates = df["Date"].astype(str)
+
+    by_date = counts.set_index(counts["Date"].astype(str))[present]
+    outside = by_date[~by_date.index.isin(grid_dates)]
+    if outside.to_numpy().any():
+        raise ValueError(
+            f"Imported posts fall on {', '.join(outside.index[outside.to_numpy().any(axis=1)])}, "
+            f"which the grid ({grid_dates.iloc[0]} to {grid_dates.iloc[-1]}) doesn't cover"
+        )
+    aligned = by_date.reindex(grid_dates).fillna(0).astype(np.int64)
+
+    if existing_counts is None:
+        merged_counts = df[[column for column in ("Day", "Date") if column in df.columns]].copy()
+    else:
+        merged_counts = existing_counts.copy()
+    for platform in present:
+        imported = aligned[platform].to_numpy()
+        if platform in merged_counts.columns:
+            merged_counts[platform] = merged_counts[platform].to_numpy() + imported
+        else:
+            merged_counts[platform] = imported
+        if platform in df.columns:
+            df[platform] = df[platform].astype(bool).to_numpy() | (imported > 0)
+        else:
+            df[platform] = imported > 0
+    return df, merged_counts
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        description="Backfill the 30-day grid from platform posting logs (CSV or JSON lines)."
+    )
+    parser.add_argument("logs", nargs="+", help="Posting log files to import")
+    parser.add_argument("--start-date", default=None,
+                        help="Challenge start date (YYYY-MM-DD); taken from --grid when given")
+    parser.add_argument("--grid", default=None,
+                        help="Existing tracker CSV to fold into (default: start from an empty grid)")
+    parser.add_argument("--out", default="habit_tracker_import.csv", help="Where to write the tracker CSV")
+    parser.add_argument("--counts-out", default=None, help="Optional CSV of per-day post counts")
+    parser.add_argument("--chunksize", type=int, default=DEFAULT_CHUNKSIZE, help="Rows per chunk")
+    parser.add_argument("--tz", default=None,
+                        help="Timezone that defines challenge days, e.g. America/Chicago (default: local time)")
+    args = parser.parse_args(argv)
+
+    if args.grid:
+        df = pd.read_csv(args.grid)
+        for platform in platforms:
+            if platform in df.columns:
+                df[platform] = df[platform].astype(bool)
+        grid_start = str(df["Date"].iloc[0])
+        if args.start_date and args.start_date != grid_start:
+            parser.error(f"--start-date {args.start_date} doesn't match the grid, which starts on {grid_start}")
+        args.start_date = grid_start
+    elif args.start_date:
+        df = empty_grid(args.start_date)
+    else:
+        parser.error("either --start-date or --grid is required")
+
+    all_counts = None
+    for path in args.logs:
+        def report(fraction, rows, path=path):
+            sys.stderr.write(f"\r{os.path.basename(path)}: {fraction:6.1%} ({rows:,} rows)")
+            sys.stderr.flush()
+
+        counts, summary = import_posting_log(path, args.start_date, chunksize=args.chunksize,
+                                             progress_callback=report, tz=args.tz)
+        sys.stderr.write("\n")
+        df, all_counts = fold_counts(df, counts, all_counts)
+        print(f"{path}: " + ", ".join(f"{key}={value:,}" for key, value in summary.items()))
+
+    df.to_csv(args.out, index=False)
+    print(f"Wrote {args.out}")
+    if args.counts_out:
+        all_counts.to_csv(args.counts_out, index=False)
+        print(f"Wrote {args.counts_out}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,85 @@
+import numpy as np
+
+from tracker_common import platforms
+
+
+# Session-state model of the days x platforms grid.
+#
+# Widgets read cell values from a cached boolean array instead of the
+# DataFrame, and stage their changes; commit() applies every staged change
+# from one rerun in a single vectorized write, bumps `version` and notifies
+# subscribers with the list of (day_idx, platform, value) cells that changed.
+# Bulk loads go through replace(), which notifies subscribers with None.
+class GridState:
+    def __init__(self, df, platform_list=platforms):
+        self.platform_list = platform_list
+        self.version = 0
+        self.listeners = {}
+        self.pending = {}
+        self._load(df)
+
+    def _load(self, df):
+        df = df.copy()
+        self.columns = [platform for platform in self.platform_list if platform in df.columns]
+        self.column_index = {platform: j for j, platform in enumerate(self.columns)}
+        for platform in self.columns:
+            df[platform] = df[platform].astype(bool)
+        self.df = df
+        self.values = df[self.columns].to_numpy(dtype=bool, copy=True)
+
+    # Function to register a change listener; re-registering a name replaces it,
+    # so listeners can be (re)attached on every rerun
+    def subscribe(self, name, callback):
+        self.listeners[name] = callback
+
+    def unsubscribe(self, name):
+        self.listeners.pop(name, None)
+
+    def _emit(self, changes):
+        for callback in list(self.listeners.values()):
+            callback(changes, self.version)
+
+    def value(self, day_idx, platform):
+        return bool(self.values[day_idx, self.column_index[platform]])
+
+    # Function to get the number of platforms posted for every day
+    def day_counts(self):
+        return self.values.sum(axis=1)
+
+    # Function to queue a cell change; nothing touches the DataFrame until commit()
+    def stage(self, day_idx, platform, value):
+        if platform not in self.column_index:
+            return
+        value = bool(value)
+        if value == self.value(day_idx, platform):
+            self.pending.pop((day_idx, platform), None)
+        else:
+            self.pending[(day_idx, platform)] = value
+
+    # Function to apply all staged changes at once; returns the changes applied
+    def commit(self):
+        if not self.pending:
+            return []
+
+        changes = [(day_idx, platform, value) for (day_idx, platform), value in self.pending.items()]
+        self.pending = {}
+
+        rows = np.fromiter((day_idx for day_idx, _, _ in changes), dtype=np.intp, count=len(changes))
+        cols = np.fromiter((self.column_index[platform] for _, platform, _ in changes), dtype=np.intp, count=len(changes))
+        self.values[rows, cols] = np.fromiter((value for _, _, value in changes), dtype=bool, count=len(changes))
+
+        # Whole-column writes keep the bool dtype, unlike scalar .loc assignment
+        for j in np.unique(cols):
+            platform = self.columns[j]
+            self.df[platform] = self.values[:, j].copy()
+
+        self.version += 1
+        self._emit(changes)
+        return changes
+
+    # Function to swap in a whole new grid (Sheets load, CSV upload, import, reset)
+    def replace(self, df):
+        self.pending = {}
+        self._load(df)
+        self.version += 1
+        self._emit(None)
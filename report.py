@@ -0,0 +1,303 @@
+import argparse
+import glob
+import hashlib
+import html
+import json
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from datetime import datetime
+
+import pandas as pd
+import plotly.graph_objects as go
+
+from tracker_common import platforms, CHALLENGE_DAYS
+from tracker_stats import compute_dashboard_stats
+
+# Bump when the report layout changes so cached reports get rebuilt
+REPORT_VERSION = 2
+MANIFEST_NAME = "manifest.json"
+
+REPORT_TEMPLATE = """<!DOCTYPE html>
+<html>
+<head>
+<meta charset="utf-8">
+<title>{title}</title>
+<style>
+    body {{ font-family: sans-serif; max-width: 1100px; margin: 2em auto; }}
+    .metrics {{ display: flex; gap: 1em; }}
+    .metric {{ flex: 1; text-align: center; padding: 1em; border-radius: 10px; background: #f6f6f6; }}
+    .big-metric {{ font-size: 3em; font-weight: bold; }}
+    .columns {{ display: flex; gap: 2em; }}
+    .columns > div {{ flex: 1; }}
+</style>
+</head>
+<body>
+<h1>🔥 {title}</h1>
+<p>Challenge started {start_date} &middot; {progress}</p>
+<div class="metrics">
+    <div class="metric"><h3>🔥 Current Streak</h3><div class="big-metric">{current_streak}</div>Longest: {longest_streak} days</div>
+    <div class="metric"><h3>✅ Completion</h3><div class="big-metric">{completion_rate:.0f}%</div>{total_posts} / {total_possible} posts</div>
+    <div class="metric"><h3>🎯 Perfect Days</h3><div class="big-metric">{days_with_all_posts}</div>All {platform_count} platforms</div>
+    <div class="metric"><h3>📈 Daily Average</h3><div class="big-metric">{avg_per_day:.1f}</div>platforms per day</div>
+</div>
+<h2>📅 30-Day Habit Grid</h2>
+{grid_chart}
+<h2>📊 Platform Insights</h2>
+{platform_chart}
+<div class="columns">
+    <div><h3>Most Consistent Platforms</h3><ul>{most_consistent}</ul></div>
+    <div><h3>Need More Attention</h3><ul>{need_attention}</ul></div>
+</div>
+</body>
+</html>
+"""
+
+INDEX_TEMPLATE = """<!DOCTYPE html>
+<html>
+<head>
+<meta charset="utf-8">
+<title>30-Day Challenge Reports</title>
+<style>
+    body {{ font-family: sans-serif; max-width: 1100px; margin: 2em auto; }}
+    table {{ border-collapse: collapse; width: 100%; }}
+    th, td {{ padding: 6px 10px; border-bottom: 1px solid #ddd; text-align: left; }}
+</style>
+</head>
+<body>
+<h1>🔥 30-Day Challenge Reports</h1>
+<p>{count} participants &middot; generated {generated}</p>
+<table>
+<tr><th>Participant</th><th>Completion</th><th>Current Streak</th><th>Longest Streak</th><th>Perfect Days</th></tr>
+{rows}
+</table>
+</body>
+</html>
+"""
+
+
+# Function to load a participant's tracker CSV (the format the app downloads)
+def load_participant(path):
+    df = pd.read_csv(path)
+    for platform in platforms:
+        if platform in df.columns:
+            df[platform] = df[platform].astype(bool)
+    return df
+
+
+# Function to hash a participant's data together with everything else the report depends on
+def participant_hash(path, challenge_day, inline_plotlyjs):
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 16), b""):
+            digest.update(block)
+    digest.update(f"|{challenge_day}|{inline_plotlyjs}|{REPORT_VERSION}".encode())
+    return digest.hexdigest()
+
+
+# Function to work out how far into the challenge a participant was on as_of.
+# Clamped to 0..CHALLENGE_DAYS: the stats are the same either side of the
+# challenge, so finished challenges don't change (or re-render) day to day.
+def challenge_day_for(df, as_of):
+    start_date = str(df["Date"].iloc[0]) if "Date" in df.columns and len(df) else as_of
+    days_elapsed = (datetime.strptime(as_of, "%Y-%m-%d") - datetime.strptime(start_date, "%Y-%m-%d")).days + 1
+    return start_date, max(0, min(days_elapsed, CHALLENGE_DAYS))
+
+
+# Function to describe how far along the challenge is
+def progress_label(challenge_day):
+    if challenge_day == 0:
+        return "not started yet"
+    if challenge_day == CHALLENGE_DAYS:
+        return "🎉 Challenge Complete!"
+    return f"Day {challenge_day} of {CHALLENGE_DAYS}"
+
+
+# Function to build the days x platforms heatmap
+def grid_figure(df):
+    present = [platform for platform in platforms if platform in df.columns]
+    grid = df[present].head(CHALLENGE_DAYS).astype(int)
+    fig = go.Figure(go.Heatmap(
+        z=grid.T.values,
+        x=[f"Day {day}" for day in df["Day"].head(CHALLENGE_DAYS)],
+        y=present,
+        colorscale=[[0, "#f8d7da"], [1, "#28a745"]],
+        showscale=False,
+        xgap=2,
+        ygap=2,
+    ))
+    fig.update_layout(height=420, margin=dict(l=10, r=10, t=10, b=10), yaxis=dict(autorange="reversed"))
+    return fig
+
+
+# Function to build the per-platform bar chart
+def platform_figure(stats):
+    names = list(stats["platform_stats"].keys())
+    counts = list(stats["platform_stats"].values())
+    fig = go.Figure(go.Bar(x=names, y=counts, marker_color="#ffc107"))
+    fig.update_layout(height=320, margin=dict(l=10, r=10, t=10, b=10),
+                      yaxis=dict(title="Days posted", range=[0, CHALLENGE_DAYS]))
+    return fig
+
+
+# Function to format a platform list for the report
+def platform_items(entries):
+    return "".join(
+        f"<li><b>{html.escape(platform)}</b>: {count}/30 days ({count / 30 * 100:.0f}%)</li>"
+        for platform, count in entries
+    )
+
+
+# Function to render one participant's report; runs in a worker process
+def render_report(name, path, out_path, challenge_day, inline_plotlyjs):
+    df = load_participant(path)
+    start_date = str(df["Date"].iloc[0]) if "Date" in df.columns and len(df) else ""
+    stats = compute_dashboard_stats(df, challenge_day)
+
+    report = REPORT_TEMPLATE.format(
+        title=html.escape(name),
+        start_date=html.escape(start_date),
+        progress=progress_label(challenge_day),
+        current_streak=stats["current_streak"],
+        longest_streak=stats["longest_streak"],
+        completion_rate=stats["completion_rate"],
+        total_posts=stats["total_posts"],
+        total_possible=stats["total_possible"],
+        days_with_all_posts=stats["days_with_all_posts"],
+        platform_count=len(platforms),
+        avg_per_day=stats["avg_per_day"],
+        # The first chart pulls in plotly.js matching the installed plotly version
+        grid_chart=grid_figure(df).to_html(full_html=False, include_plotlyjs=True if inline_plotlyjs else "cdn"),
+        platform_chart=platform_figure(stats).to_html(full_html=False, include_plotlyjs=False),
+        most_consistent=platform_items(stats["most_consistent"]),
+        need_attention=platform_items(stats["need_attention"]),
+    )
+    with open(out_path, "w", encoding="utf-8") as f:
+        f.write(report)
+
+    return {
+        "completion_rate": stats["completion_rate"],
+        "current_streak": stats["current_streak"],
+        "longest_streak": stats["longest_streak"],
+        "days_with_all_posts": stats["days_with_all_posts"],
+    }
+
+
+# Function to write the index page linking every report
+def write_index(out_dir, manifest):
+    rows = "\n".join(
+        f'<tr><td><a href="{html.escape(name)}.html">{html.escape(name)}</a></td>'
+        f'<td>{entry["summary"]["completion_rate"]:.0f}%</td>'
+        f'<td>{entry["summary"]["current_streak"]}</td>'
+        f'<td>{entry["summary"]["longest_streak"]}</td>'
+        f'<td>{entry["summary"]["days_with_all_posts"]}</td></tr>'
+        for name, entry in sorted(manifest.items())
+    )
+    with open(os.path.join(out_dir, "index.html"), "w", encoding="utf-8") as f:
+        f.write(INDEX_TEMPLATE.format(
+            count=len(manifest),
+            generated=datetime.now().strftime("%Y-%m-%d %H:%M"),
+            rows=rows,
+        ))
+
+
+# Function to collect participant CSVs from files and directories
+def find_participants(inputs):
+    participants = {}
+    for item in inputs:
+        paths = sorted(glob.glob(os.path.join(item, "*.csv"))) if os.path.isdir(item) else [item]
+        for path in paths:
+            name = os.path.splitext(os.path.basename(path))[0]
+            if name in participants and os.path.abspath(participants[name]) != os.path.abspath(path):
+                raise ValueError(f"Two participants are both named '{name}': {participants[name]} and {path}")
+            participants[name] = path
+    return participants
+
+
+def generate_reports(inputs, out_dir, as_of=None, workers=None, force=False, inline_plotlyjs=False):
+    if as_of is None:
+        as_of = datetime.now().strftime("%Y-%m-%d")
+    os.makedirs(out_dir, exist_ok=True)
+
+    manifest_path = os.path.join(out_dir, MANIFEST_NAME)
+    manifest = {}
+    if os.path.exists(manifest_path) and not force:
+        with open(manifest_path, encoding="utf-8") as f:
+            manifest = json.load(f)
+
+    participants = find_participants(inputs)
+    # Drop participants that are no longer in the input set
+    manifest = {name: entry for name, entry in manifest.items() if name in participants}
+
+    pending = {}
+    failed = {}
+    for name, path in participants.items():
+        try:
+            _, challenge_day = challenge_day_for(pd.read_csv(path, nrows=1), as_of)
+        except Exception as e:
+            failed[name] = str(e)
+            manifest.pop(name, None)
+            continue
+        data_hash = participant_hash(path, challenge_day, inline_plotlyjs)
+        out_path = os.path.join(out_dir, f"{name}.html")
+        entry = manifest.get(name)
+        if entry and entry["hash"] == data_hash and os.path.exists(out_path):
+            continue
+        pending[name] = (path, out_path, challenge_day, data_hash)
+
+    rendered = 0
+    if pending:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            futures = {
+                pool.submit(render_report, name, path, out_path, challenge_day, inline_plotlyjs): name
+                for name, (path, out_path, challenge_day, _) in pending.items()
+            }
+            for done, future in enumerate(as_completed(futures), 1):
+                name = futures[future]
+                try:
+                    manifest[name] = {"hash": pending[name][3], "summary": future.result()}
+                    rendered += 1
+                except Exception as e:
+                    manifest.pop(name, None)
+                    failed[name] = str(e)
+                sys.stderr.write(f"\rRendered {done}/{len(pending)} reports")
+                sys.stderr.flush()
+        sys.stderr.write("\n")
+
+    with open(manifest_path, "w", encoding="utf-8") as f:
+        json.dump(manifest, f, indent=1, sort_keys=True)
+    write_index(out_dir, manifest)
+
+    return {
+        "rendered": rendered,
+        "skipped": sum(1 for name in participants if name not in pending and name not in failed),
+        "failed": failed,
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        description="Render a standalone HTML report for every challenge participant."
+    )
+    parser.add_argument("inputs", nargs="+",
+                        help="Participant tracker CSVs, or directories of them (one CSV per participant)")
+    parser.add_argument("--out", default="reports", help="Output directory")
+    parser.add_argument("--as-of", default=None, help="Report date (YYYY-MM-DD), default today")
+    parser.add_argument("--workers", type=int, default=None, help="Worker processes (default: CPU count)")
+    parser.add_argument("--force", action="store_true", help="Re-render every report, ignoring the cache")
+    parser.add_argument("--inline-plotlyjs", action="store_true",
+                        help="Embed plotly.js in each report instead of loading it from the CDN")
+    args = parser.parse_args(argv)
+
+    try:
+        result = generate_reports(args.inputs, args.out, as_of=args.as_of, workers=args.workers,
+                                  force=args.force, inline_plotlyjs=args.inline_plotlyjs)
+    except ValueError as e:
+        parser.error(str(e))
+    print(f"Rendered {result['rendered']}, unchanged {result['skipped']}, failed {len(result['failed'])}")
+    for name, error in sorted(result["failed"].items()):
+        print(f"  {name}: {error}")
+
+
+if __name__ == "__main__":
+    main()
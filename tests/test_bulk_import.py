@@ -0,0 +1,131 @@
+import io
+import json
+
+import pandas as pd
+import pytest
+
+from bulk_import import fold_counts, import_posting_log, parse_timestamps
+from tracker_common import platforms, empty_grid
+
+
+def log_file(text, name):
+    handle = io.BytesIO(text.encode())
+    handle.name = name
+    return handle
+
+
+def test_parse_timestamps_handles_each_value_on_its_own():
+    epoch = int(pd.Timestamp("2026-01-01 18:00", tz="UTC").timestamp())
+    values = pd.Series([
+        str(epoch),
+        epoch * 1000,
+        "2026-01-01T23:30Z",
+        "2026-01-01T23:30-05:00",
+        "2026-01-01 23:30",
+        "20260102",
+        None,
+        "not a date",
+    ], dtype=object)
+
+    parsed = parse_timestamps(values, "America/Chicago")
+
+    assert parsed.tolist()[:6] == [
+        pd.Timestamp("2026-01-01 12:00"),
+        pd.Timestamp("2026-01-01 12:00"),
+        pd.Timestamp("2026-01-01 17:30"),
+        pd.Timestamp("2026-01-01 22:30"),
+        pd.Timestamp("2026-01-01 23:30"),
+        pd.Timestamp("2026-01-02 00:00"),
+    ]
+    assert parsed.iloc[6:].isna().all()
+
+
+def test_numeric_column_is_read_as_epoch_seconds():
+    epoch = int(pd.Timestamp("2026-01-01", tz="UTC").timestamp())
+    parsed = parse_timestamps(pd.Series([epoch, epoch + 86400]), "UTC")
+    assert parsed.tolist() == [pd.Timestamp("2026-01-01"), pd.Timestamp("2026-01-02")]
+
+
+def test_jsonl_chunks_with_different_keys():
+    records = [
+        {"timestamp": "2026-01-01T10:00", "platform": "fb", "post_id": 1},
+        {"timestamp": "2026-01-01T11:00", "platform": "fb", "post_id": 1},
+        {"timestamp": "2026-01-02T10:00", "platform": "Twitter"},
+        {"posted_at": "2026-01-02T10:00", "network": "IG"},
+        {"platform": "fb"},
+        {"timestamp": "2026-01-03T10:00"},
+    ]
+    text = "\n".join(json.dumps(record) for record in records) + "\n"
+
+    counts, summary = import_posting_log(log_file(text, "log.jsonl"), "2026-01-01", chunksize=2, tz="UTC")
+
+    assert summary["rows_read"] == 6
+    assert summary["duplicates"] == 1
+    assert summary["bad_timestamp"] == 1
+    assert summary["unknown_platform"] == 1
+    assert summary["rows_imported"] == 3
+    assert counts.loc[0, "Facebook"] == 1
+    assert counts.loc[1, "X (Twitter)"] == 1
+    assert counts.loc[1, "Instagram"] == 1
+
+
+def test_csv_drops_duplicates_within_a_chunk_only():
+    text = (
+        "timestamp,platform,post_id\n"
+        "2026-01-01 10:00,Facebook,a\n"
+        "2026-01-01 10:00,Facebook,a\n"
+        "2026-01-01 10:00,Facebook,a\n"
+        "2026-01-01 10:00,Facebook,\n"
+        "2026-01-01 10:00,Facebook,\n"
+        "2026-02-15 10:00,Facebook,b\n"
+    )
+
+    counts, summary = import_posting_log(log_file(text, "log.csv"), "2026-01-01", chunksize=2, tz="UTC")
+
+    # Rows 1-2 share a chunk; row 3 repeats "a" in the next chunk; rows without ids are all kept
+    assert summary["duplicates"] == 1
+    assert summary["outside_challenge"] == 1
+    assert counts.loc[0, "Facebook"] == 4
+
+
+def test_json_array_exports_are_rejected():
+    with pytest.raises(ValueError, match="JSON lines"):
+        import_posting_log(log_file("[]", "log.json"), "2026-01-01")
+
+
+def test_fold_counts_merges_by_date():
+    grid = empty_grid("2026-01-01")
+    grid.loc[0, "Facebook"] = True
+
+    first = empty_grid("2026-01-01")[["Day", "Date"]]
+    for platform in platforms:
+        first[platform] = 0
+    first.loc[1, "Instagram"] = 3
+
+    # Counts for a window starting a day later still land on the matching dates
+    second = empty_grid("2026-01-02")[["Day", "Date"]]
+    for platform in platforms:
+        second[platform] = 0
+    second.loc[0, "Instagram"] = 2
+    second.loc[28, "TikTok"] = 1
+
+    grid, counts = fold_counts(grid, first)
+    grid, counts = fold_counts(grid, second, counts)
+
+    assert grid.loc[0, "Facebook"]
+    assert grid.loc[1, "Instagram"]
+    assert grid.loc[29, "TikTok"]
+    assert grid[platforms].sum().sum() == 3
+    assert grid["Instagram"].dtype == bool
+    assert counts.loc[1, "Instagram"] == 5
+    assert counts.loc[29, "TikTok"] == 1
+
+
+def test_fold_counts_rejects_posts_outside_the_grid():
+    counts = empty_grid("2026-01-02")[["Day", "Date"]]
+    for platform in platforms:
+        counts[platform] = 0
+    counts.loc[29, "Facebook"] = 1
+
+    with pytest.raises(ValueError, match="2026-01-31"):
+        fold_counts(empty_grid("2026-01-01"), counts)
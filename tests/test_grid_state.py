@@ -0,0 +1,71 @@
+from grid_state import GridState
+from tracker_common import platforms, empty_grid
+
+
+def recording_grid():
+    grid = GridState(empty_grid("2026-01-01"))
+    events = []
+    grid.subscribe("test", lambda changes, version: events.append((changes, version)))
+    return grid, events
+
+
+def test_commit_applies_staged_changes_in_one_event():
+    grid, events = recording_grid()
+
+    grid.stage(0, "Facebook", True)
+    grid.stage(3, "TikTok", True)
+    grid.stage(3, "TikTok", True)
+    changes = grid.commit()
+
+    assert sorted(changes) == [(0, "Facebook", True), (3, "TikTok", True)]
+    assert events == [(changes, 1)]
+    assert grid.version == 1
+    assert grid.value(0, "Facebook") and grid.value(3, "TikTok")
+    assert grid.df.loc[0, "Facebook"] and grid.df.loc[3, "TikTok"]
+    assert grid.day_counts()[3] == 1
+    assert all(grid.df[platform].dtype == bool for platform in platforms)
+
+
+def test_stage_that_undoes_itself_is_dropped():
+    grid, events = recording_grid()
+
+    grid.stage(0, "Facebook", True)
+    grid.stage(0, "Facebook", False)
+    grid.stage(1, "Instagram", False)
+
+    assert grid.commit() == []
+    assert events == []
+    assert grid.version == 0
+
+
+def test_stage_ignores_unknown_platforms():
+    grid, _ = recording_grid()
+    grid.stage(0, "Myspace", True)
+    assert grid.commit() == []
+
+
+def test_replace_loads_new_grid_and_emits_none():
+    grid, events = recording_grid()
+    grid.stage(0, "Facebook", True)
+
+    loaded = empty_grid("2026-01-01")
+    loaded["Instagram"] = ["TRUE", ""] * 15
+    grid.replace(loaded)
+
+    assert events == [(None, 1)]
+    assert grid.commit() == []
+    assert not grid.value(0, "Facebook")
+    assert grid.value(0, "Instagram") and not grid.value(1, "Instagram")
+    assert grid.df["Instagram"].dtype == bool
+
+
+def test_subscribe_replaces_listener_with_same_name():
+    grid, events = recording_grid()
+    others = []
+    grid.subscribe("test", lambda changes, version: others.append(version))
+
+    grid.stage(0, "Facebook", True)
+    grid.commit()
+
+    assert events == []
+    assert others == [1]
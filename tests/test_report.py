@@ -0,0 +1,66 @@
+import pytest
+
+pytest.importorskip("plotly")
+
+import report
+from tracker_common import platforms, empty_grid
+
+
+def write_participant(path, start_date, posted_days):
+    df = empty_grid(start_date)
+    df.loc[:posted_days - 1, platforms[:6]] = True
+    df.to_csv(path, index=False)
+
+
+@pytest.fixture
+def participants(tmp_path):
+    inputs = tmp_path / "in"
+    inputs.mkdir()
+    for i in range(4):
+        write_participant(inputs / f"p{i}.csv", "2026-09-01", i + 1)
+    (inputs / "empty.csv").write_text("")
+    return inputs
+
+
+def test_second_run_skips_unchanged_participants(participants, tmp_path):
+    out = tmp_path / "out"
+
+    first = report.generate_reports([str(participants)], str(out), as_of="2026-09-10", workers=1)
+    assert first["rendered"] == 4
+    assert first["skipped"] == 0
+    assert list(first["failed"]) == ["empty"]
+
+    second = report.generate_reports([str(participants)], str(out), as_of="2026-09-10", workers=1)
+    assert second["rendered"] == 0
+    assert second["skipped"] == 4
+    assert list(second["failed"]) == ["empty"]
+    assert sorted(p.name for p in out.glob("p*.html")) == [f"p{i}.html" for i in range(4)]
+
+
+def test_rerenders_changed_data_and_running_challenges(participants, tmp_path):
+    out = tmp_path / "out"
+    report.generate_reports([str(participants)], str(out), as_of="2026-09-10", workers=1)
+
+    write_participant(participants / "p0.csv", "2026-09-01", 20)
+    result = report.generate_reports([str(participants)], str(out), as_of="2026-09-10", workers=1)
+    assert result["rendered"] == 1
+    assert result["skipped"] == 3
+
+    # A later day changes the current streak of every running challenge...
+    result = report.generate_reports([str(participants)], str(out), as_of="2026-09-11", workers=1)
+    assert result["rendered"] == 4
+
+    # ...but once the challenges are over, new run dates change nothing
+    report.generate_reports([str(participants)], str(out), as_of="2026-12-01", workers=1)
+    result = report.generate_reports([str(participants)], str(out), as_of="2027-01-01", workers=1)
+    assert result["rendered"] == 0
+    assert result["skipped"] == 4
+
+
+def test_duplicate_participant_names_are_rejected(tmp_path):
+    for folder in ("a", "b"):
+        (tmp_path / folder).mkdir()
+        write_participant(tmp_path / folder / "alice.csv", "2026-09-01", 1)
+
+    with pytest.raises(ValueError, match="alice"):
+        report.find_participants([str(tmp_path / "a"), str(tmp_path / "b")])
@@ -0,0 +1,60 @@
+import random
+
+import pytest
+
+from grid_state import GridState
+from tracker_common import platforms, CHALLENGE_DAYS, empty_grid
+from tracker_stats import GridAggregates, compute_dashboard_stats
+
+
+def random_commit(grid, rng):
+    # Mostly single clicks, sometimes a batch; bias towards True so streaks form
+    for _ in range(rng.choice([1, 1, 1, 2, 5, 25])):
+        grid.stage(rng.randrange(CHALLENGE_DAYS), rng.choice(platforms), rng.random() < 0.65)
+    return grid.commit()
+
+
+@pytest.mark.parametrize("seed", range(5))
+def test_aggregates_match_full_recompute(seed):
+    rng = random.Random(seed)
+    grid = GridState(empty_grid("2026-01-01"))
+    aggregates = GridAggregates(grid, verify_every=0)
+
+    for _ in range(1500):
+        random_commit(grid, rng)
+        days_elapsed = rng.randrange(-2, CHALLENGE_DAYS + 10)
+        assert aggregates.stats(days_elapsed) == compute_dashboard_stats(grid.df, days_elapsed)
+
+
+def test_aggregates_rebuild_only_on_bulk_load(monkeypatch):
+    rng = random.Random(0)
+    grid = GridState(empty_grid("2026-01-01"))
+    aggregates = GridAggregates(grid, verify_every=0)
+
+    rebuilds = []
+    original_rebuild = aggregates.rebuild
+    monkeypatch.setattr(aggregates, "rebuild", lambda: (rebuilds.append(grid.version), original_rebuild())[1])
+
+    for _ in range(200):
+        random_commit(grid, rng)
+    assert rebuilds == []
+
+    loaded = empty_grid("2026-01-01")
+    loaded.loc[:9, platforms] = True
+    grid.replace(loaded)
+    assert rebuilds == [grid.version]
+    assert aggregates.stats(CHALLENGE_DAYS) == compute_dashboard_stats(grid.df, CHALLENGE_DAYS)
+    assert aggregates.longest_streak() == 10
+
+
+def test_verify_rebuilds_after_drift():
+    grid = GridState(empty_grid("2026-01-01"))
+    aggregates = GridAggregates(grid, verify_every=0)
+    grid.stage(0, platforms[0], True)
+    grid.commit()
+
+    aggregates.total_posts += 3
+    assert not aggregates.verify()
+    assert aggregates.mismatches == 1
+    assert aggregates.total_posts == 1
+    assert aggregates.verify()
@@ -0,0 +1,26 @@
+from datetime import datetime, timedelta
+
+import pandas as pd
+
+# Platform list
+platforms = [
+    "Facebook", "Instagram", "X (Twitter)", "Threads", "Pinterest",
+    "TikTok", "YouTube", "LinkedIn", "Fanbase", "Facebook Groups"
+]
+
+CHALLENGE_DAYS = 30
+
+# Function to build an empty days x platforms grid starting at start_date
+def empty_grid(start_date=None, platform_list=platforms):
+    if start_date is None:
+        start_date = datetime.now()
+    elif isinstance(start_date, str):
+        start_date = datetime.strptime(start_date, "%Y-%m-%d")
+
+    dates = [(start_date + timedelta(days=i)).strftime("%Y-%m-%d") for i in range(CHALLENGE_DAYS)]
+
+    data = {"Day": [i+1 for i in range(CHALLENGE_DAYS)], "Date": dates}
+    for platform in platform_list:
+        data[platform] = [False] * CHALLENGE_DAYS
+
+    return pd.DataFrame(data)
@@ -0,0 +1,213 @@
+import bisect
+import heapq
+from collections import Counter
+
+from tracker_common import platforms, CHALLENGE_DAYS
+
+# Posting to at least this many platforms keeps a streak alive
+STREAK_THRESHOLD = 5
+
+
+# Function to compute streaks from per-day post counts
+def compute_streaks(posts_per_day, days_elapsed, threshold=STREAK_THRESHOLD):
+    current_streak = 0
+    longest_streak = 0
+    temp_streak = 0
+
+    for i, posts_today in enumerate(posts_per_day):
+        if posts_today >= threshold:
+            temp_streak += 1
+            longest_streak = max(longest_streak, temp_streak)
+            if i < days_elapsed:
+                current_streak = temp_streak
+        else:
+            temp_streak = 0
+            if i < days_elapsed:
+                current_streak = 0
+
+    return current_streak, longest_streak
+
+
+# Function to compute every number shown on the progress dashboard
+def compute_dashboard_stats(df, days_elapsed, platform_list=platforms):
+    present = [platform for platform in platform_list if platform in df.columns]
+    grid = df[present].head(CHALLENGE_DAYS).astype(bool)
+
+    posts_per_day = grid.sum(axis=1).astype(int).tolist()
+    platform_stats = {platform: int(grid[platform].sum()) for platform in present}
+    total_posts = sum(platform_stats.values())
+    total_possible = CHALLENGE_DAYS * len(platform_list)
+    current_streak, longest_streak = compute_streaks(posts_per_day, days_elapsed)
+    sorted_platforms = sorted(platform_stats.items(), key=lambda x: x[1], reverse=True)
+
+    return {
+        "total_posts": total_posts,
+        "total_possible": total_possible,
+        "completion_rate": total_posts / total_possible * 100,
+        "current_streak": current_streak,
+        "longest_streak": longest_streak,
+        "days_with_all_posts": int(grid.all(axis=1).sum()),
+        "avg_per_day": total_posts / CHALLENGE_DAYS,
+        "posts_per_day": posts_per_day,
+        "platform_stats": platform_stats,
+        "most_consistent": sorted_platforms[:5],
+        "need_attention": sorted_platforms[-5:],
+    }
+
+
+# Dashboard numbers kept up to date from GridState change events.
+#
+# A cell toggle adjusts one day count and one platform total, and only
+# touches streaks when the day crosses STREAK_THRESHOLD, which merges or
+# splits a run of qualifying days. Runs are kept as sorted start days with
+# their end days, and run lengths in a lazily-cleaned max-heap, so each
+# toggle is O(log n). Bulk loads (GridState.replace) trigger a full rebuild,
+# and every `verify_every` toggles the totals are checked against
+# compute_dashboard_stats and rebuilt if they have drifted.
+class GridAggregates:
+    def __init__(self, grid, verify_every=100):
+        self.grid = grid
+        self.verify_every = verify_every
+        self.mismatches = 0
+        self.rebuild()
+        grid.subscribe('aggregates', self.on_change)
+
+    def rebuild(self):
+        self.columns = list(self.grid.columns)
+        self.column_index = dict(self.grid.column_index)
+        grid_values = self.grid.values[:CHALLENGE_DAYS]
+
+        self.posts_per_day = [int(count) for count in grid_values.sum(axis=1)]
+        self.platform_totals = [int(count) for count in grid_values.sum(axis=0)]
+        self.total_posts = sum(self.platform_totals)
+        self.days_with_all_posts = sum(1 for count in self.posts_per_day if count == len(self.columns))
+
+        self.run_starts = []
+        self.run_ends = {}
+        self.run_start_of_end = {}
+        self.run_lengths = Counter()
+        self.length_heap = []
+        start = None
+        for day_idx, count in enumerate(self.posts_per_day + [0]):
+            if count >= STREAK_THRESHOLD:
+                if start is None:
+                    start = day_idx
+            elif start is not None:
+                self._add_run(start, day_idx - 1)
+                start = None
+
+        self.version = self.grid.version
+        self.toggles_since_verify = 0
+
+    def _add_run(self, start, end):
+        bisect.insort(self.run_starts, start)
+        self.run_ends[start] = end
+        self.run_start_of_end[end] = start
+        length = end - start + 1
+        self.run_lengths[length] += 1
+        heapq.heappush(self.length_heap, -length)
+        # Drop stale lengths once they outnumber the live runs
+        if len(self.length_heap) > 2 * CHALLENGE_DAYS:
+            self.length_heap = [-live for live in self.run_lengths]
+            heapq.heapify(self.length_heap)
+
+    def _remove_run(self, start):
+        end = self.run_ends.pop(start)
+        del self.run_start_of_end[end]
+        del self.run_starts[bisect.bisect_left(self.run_starts, start)]
+        length = end - start + 1
+        self.run_lengths[length] -= 1
+        if not self.run_lengths[length]:
+            del self.run_lengths[length]
+        return end
+
+    # Function to find the start of the qualifying run containing day_idx
+    def _run_start(self, day_idx):
+        i = bisect.bisect_right(self.run_starts, day_idx) - 1
+        if i >= 0 and self.run_ends[self.run_starts[i]] >= day_idx:
+            return self.run_starts[i]
+        return None
+
+    def _toggle(self, day_idx, platform, value):
+        if day_idx >= len(self.posts_per_day):
+            return
+        delta = 1 if value else -1
+        before = self.posts_per_day[day_idx]
+        after = before + delta
+        self.posts_per_day[day_idx] = after
+        self.platform_totals[self.column_index[platform]] += delta
+        self.total_posts += delta
+
+        perfect = len(self.columns)
+        self.days_with_all_posts += (after == perfect) - (before == perfect)
+
+        if before < STREAK_THRESHOLD <= after:
+            start = self.run_start_of_end.get(day_idx - 1, day_idx)
+            if start != day_idx:
+                self._remove_run(start)
+            end = day_idx
+            if day_idx + 1 in self.run_ends:
+                end = self._remove_run(day_idx + 1)
+            self._add_run(start, end)
+        elif after < STREAK_THRESHOLD <= before:
+            start = self._run_start(day_idx)
+            end = self._remove_run(start)
+            if start < day_idx:
+                self._add_run(start, day_idx - 1)
+            if day_idx < end:
+                self._add_run(day_idx + 1, end)
+
+    # GridState listener
+    def on_change(self, changes, version):
+        if changes is None or list(self.grid.columns) != self.columns:
+            self.rebuild()
+            return
+
+        for day_idx, platform, value in changes:
+            self._toggle(day_idx, platform, value)
+        self.version = version
+
+        self.toggles_since_verify += len(changes)
+        if self.verify_every and self.toggles_since_verify >= self.verify_every:
+            self.verify()
+
+    def longest_streak(self):
+        while self.length_heap and not self.run_lengths[-self.length_heap[0]]:
+            heapq.heappop(self.length_heap)
+        return -self.length_heap[0] if self.length_heap else 0
+
+    def current_streak(self, days_elapsed):
+        day_idx = min(days_elapsed, len(self.posts_per_day)) - 1
+        if day_idx < 0:
+            return 0
+        start = self._run_start(day_idx)
+        return 0 if start is None else day_idx - start + 1
+
+    # Function to return the same numbers as compute_dashboard_stats
+    def stats(self, days_elapsed, platform_list=platforms):
+        total_possible = CHALLENGE_DAYS * len(platform_list)
+        platform_stats = dict(zip(self.columns, self.platform_totals))
+        sorted_platforms = sorted(platform_stats.items(), key=lambda x: x[1], reverse=True)
+
+        return {
+            "total_posts": self.total_posts,
+            "total_possible": total_possible,
+            "completion_rate": self.total_posts / total_possible * 100,
+            "current_streak": self.current_streak(days_elapsed),
+            "longest_streak": self.longest_streak(),
+            "days_with_all_posts": self.days_with_all_posts,
+            "avg_per_day": self.total_posts / CHALLENGE_DAYS,
+            "posts_per_day": list(self.posts_per_day),
+            "platform_stats": platform_stats,
+            "most_consistent": sorted_platforms[:5],
+            "need_attention": sorted_platforms[-5:],
+        }
+
+    # Function to check the running totals against a full recompute; rebuilds on drift
+    def verify(self, days_elapsed=CHALLENGE_DAYS):
+        self.toggles_since_verify = 0
+        if self.stats(days_elapsed) == compute_dashboard_stats(self.grid.df, days_elapsed):
+            return True
+        self.mismatches += 1
+        self.rebuild()
+        return False